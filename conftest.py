@@ -0,0 +1,145 @@
+"""
+Shared pytest fixtures for the RNRL TradeHub backend tests.
+"""
+import os
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+# Cheapest bcrypt cost; must be set before utils is imported by any test module
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+# In-memory SQLite shared by every connection through StaticPool
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+# Raised by the mocked SessionLocal when simulating an unreachable database
+_CONN_REFUSED_ERR = OperationalError(
+    "could not connect to server",
+    params=None,
+    orig=Exception("Connection refused")
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    Provide a single TestClient for the whole test session.
+
+    The client and the app's middleware stack are built once and reused
+    by every test that needs to make HTTP requests. The client is not
+    entered as a context manager, so the app's startup handlers (which
+    create tables on the configured database) never run under test.
+    """
+    from main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def db_client(client, db):
+    """
+    Provide the shared TestClient with get_db bound to the test session.
+
+    Only the dependency override is swapped per test; the client and app
+    from the session-scoped client fixture are reused. The override is
+    keyed on the get_db the routes in routes_complete depend on.
+    """
+    from main import app
+    from routes_complete import get_db
+
+    def _override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = _override_get_db
+    try:
+        yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests on asyncio via the anyio pytest plugin."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def async_client(anyio_backend):
+    """
+    Provide an AsyncClient that calls the app directly over ASGI.
+
+    Requests go straight through the middleware stack without the
+    sync-to-async thread hop that TestClient performs.
+    """
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http_client:
+        yield http_client
+
+
+@pytest.fixture
+def broken_session_local(monkeypatch):
+    """Make database.SessionLocal raise a connection error, as when the DB is down."""
+    monkeypatch.setattr("database.SessionLocal", MagicMock(side_effect=_CONN_REFUSED_ERR))
+    yield
+
+
+@pytest.fixture(scope="session")
+def _db_engine():
+    """Create the in-memory test engine and all tables once per session, then dispose of it."""
+    # Use the Base the models were declared on
+    from models import Base
+
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # pysqlite manages transactions itself and breaks SAVEPOINT; let
+    # SQLAlchemy emit BEGIN so the per-test savepoints in db work
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # The in-memory database starts empty, so skip the per-table existence checks
+    Base.metadata.create_all(bind=engine, checkfirst=False)
+    yield engine
+
+    # Disposing closes the only connection, which discards the in-memory database
+    engine.dispose()
+
+
+@pytest.fixture
+def db(_db_engine):
+    """
+    Provide a session on the shared in-memory test database.
+
+    The whole test runs inside an outer transaction that is rolled back on
+    teardown. Commits made by the test only release a SAVEPOINT, so each
+    test starts from the empty schema without re-running create_all.
+    """
+    connection = _db_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
+    )
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
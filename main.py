@@ -21,6 +21,7 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
 from database import get_db, engine, Base
 from schemas import HealthCheckResponse
@@ -116,6 +117,25 @@ async def validation_exception_handler(request, exc):
     )
 
 
+@app.exception_handler(OperationalError)
+async def database_unavailable_handler(request, exc):
+    """
+    Report a lost or unreachable database as 503 Service Unavailable.
+    The driver's message is logged, not returned, as it may name hosts.
+    Includes CORS headers to prevent CORS errors in browser.
+    """
+    logger.error("Database unavailable: %s", str(exc), exc_info=True)
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": "Database connection unavailable. Please try again later.",
+            "status_code": 503,
+            "framework": "FastAPI"
+        },
+        headers=get_cors_headers()
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """
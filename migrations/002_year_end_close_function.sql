@@ -0,0 +1,116 @@
+-- Migration: Year-End Closing Function
+-- Description: Adds the year_end_close() PL/pgSQL function that performs the complete
+--              year-end closing (transfers, transfer logs, opening balances and financial
+--              year flags) in a single database round trip. Used by
+--              YearEndService.complete_year_end_closing when YEAR_END_DB_FUNCTION=true.
+
+-- ============================================================================
+-- year_end_close(from_fy_id, to_fy_id, organization_id, performed_by,
+--                invoice_statuses, commission_status, dispute_status)
+-- ============================================================================
+-- The carried-forward statuses are passed in by YearEndService so they are
+-- defined in one place (the module constants in services/year_end_service.py).
+-- Returns the same summary as the Python implementation, as JSONB:
+--   invoices_transferred, commissions_transferred, disputes_transferred,
+--   opening_balances, from_financial_year, to_financial_year, closed_at
+
+CREATE OR REPLACE FUNCTION year_end_close(
+  p_from_fy_id INTEGER,
+  p_to_fy_id INTEGER,
+  p_organization_id INTEGER,
+  p_performed_by VARCHAR,
+  p_invoice_statuses VARCHAR[],
+  p_commission_status VARCHAR,
+  p_dispute_status VARCHAR
+)
+RETURNS JSONB AS $$
+DECLARE
+  v_from_code VARCHAR(20);
+  v_to_code VARCHAR(20);
+  v_invoices INTEGER;
+  v_commissions INTEGER;
+  v_disputes INTEGER;
+  v_opening JSONB;
+  v_now TIMESTAMP := (now() AT TIME ZONE 'utc');
+BEGIN
+  SELECT year_code INTO v_from_code FROM financial_years WHERE id = p_from_fy_id;
+  SELECT year_code INTO v_to_code FROM financial_years WHERE id = p_to_fy_id;
+
+  IF v_from_code IS NULL OR v_to_code IS NULL THEN
+    RAISE EXCEPTION 'Invalid financial year IDs';
+  END IF;
+
+  -- Transfer pending invoices, due commissions and open disputes
+  UPDATE invoices SET financial_year = v_to_code, updated_at = v_now
+   WHERE organization_id = p_organization_id
+     AND financial_year = v_from_code
+     AND status::VARCHAR = ANY(p_invoice_statuses);
+  GET DIAGNOSTICS v_invoices = ROW_COUNT;
+
+  UPDATE commissions SET financial_year = v_to_code, updated_at = v_now
+   WHERE organization_id = p_organization_id
+     AND financial_year = v_from_code
+     AND status::VARCHAR = p_commission_status;
+  GET DIAGNOSTICS v_commissions = ROW_COUNT;
+
+  UPDATE disputes SET financial_year = v_to_code, updated_at = v_now
+   WHERE organization_id = p_organization_id
+     AND financial_year = v_from_code
+     AND status::VARCHAR = p_dispute_status;
+  GET DIAGNOSTICS v_disputes = ROW_COUNT;
+
+  -- Log transfers
+  INSERT INTO year_end_transfers (
+    organization_id, from_financial_year_id, to_financial_year_id, transfer_date,
+    transfer_type, entity_type, entity_count, transfer_summary, performed_by,
+    created_at, updated_at
+  ) VALUES
+    (p_organization_id, p_from_fy_id, p_to_fy_id, v_now,
+     'pending_invoices', 'invoice', v_invoices,
+     json_build_object('status', p_invoice_statuses), p_performed_by, v_now, v_now),
+    (p_organization_id, p_from_fy_id, p_to_fy_id, v_now,
+     'pending_commissions', 'commission', v_commissions,
+     json_build_object('status', p_commission_status), p_performed_by, v_now, v_now),
+    (p_organization_id, p_from_fy_id, p_to_fy_id, v_now,
+     'open_disputes', 'dispute', v_disputes,
+     json_build_object('status', p_dispute_status), p_performed_by, v_now, v_now);
+
+  -- Opening balances for the new financial year
+  SELECT jsonb_build_object(
+           'outstanding_invoices', inv.total,
+           'due_commissions', comm.total,
+           'invoice_count', inv.cnt,
+           'commission_count', comm.cnt
+         )
+    INTO v_opening
+    FROM (SELECT COALESCE(SUM(amount), 0) AS total, COUNT(*) AS cnt
+            FROM invoices
+           WHERE organization_id = p_organization_id
+             AND financial_year = v_to_code
+             AND status != 'Paid') AS inv,
+         (SELECT COALESCE(SUM(amount), 0) AS total, COUNT(*) AS cnt
+            FROM commissions
+           WHERE organization_id = p_organization_id
+             AND financial_year = v_to_code
+             AND status::VARCHAR = p_commission_status) AS comm;
+
+  -- Close old FY and activate new FY
+  UPDATE financial_years
+     SET is_closed = true, is_active = false, updated_at = v_now
+   WHERE id = p_from_fy_id;
+
+  UPDATE financial_years
+     SET is_active = true, opening_balances = v_opening::json, updated_at = v_now
+   WHERE id = p_to_fy_id;
+
+  RETURN jsonb_build_object(
+    'invoices_transferred', v_invoices,
+    'commissions_transferred', v_commissions,
+    'disputes_transferred', v_disputes,
+    'opening_balances', v_opening,
+    'from_financial_year', v_from_code,
+    'to_financial_year', v_to_code,
+    'closed_at', to_char(v_now, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+  );
+END;
+$$ LANGUAGE plpgsql;
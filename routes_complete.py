@@ -13,7 +13,7 @@ from sqlalchemy.orm import Session
 from database import get_db
 import models
 import schemas
-from utils import hash_password
+from utils import enum_value, hash_password
 from crud_helpers import get_entity_by_id, check_entity_exists, hard_delete_entity, soft_delete_entity
 
 
@@ -650,7 +650,7 @@ def list_settings_users(
                 "role_id": user.role_id,
                 "role_name": user.role.name if user.role else None,
                 "is_active": user.is_active,
-                "user_type": user.user_type.value if hasattr(user.user_type, 'value') else str(user.user_type),
+                "user_type": enum_value(user.user_type),
                 "client_id": user.client_id,
                 "vendor_id": user.vendor_id,
                 "parent_user_id": user.parent_user_id,
@@ -741,7 +741,7 @@ def create_settings_user(
         "role_id": db_user.role_id,
         "role_name": db_user.role.name if db_user.role else None,
         "is_active": db_user.is_active,
-        "user_type": db_user.user_type.value if hasattr(db_user.user_type, 'value') else str(db_user.user_type),
+        "user_type": enum_value(db_user.user_type),
         "client_id": db_user.client_id,
         "vendor_id": db_user.vendor_id,
         "parent_user_id": db_user.parent_user_id,
@@ -815,7 +815,7 @@ def update_settings_user(
         "role_id": user.role_id,
         "role_name": user.role.name if user.role else None,
         "is_active": user.is_active,
-        "user_type": user.user_type.value if hasattr(user.user_type, 'value') else str(user.user_type),
+        "user_type": enum_value(user.user_type),
         "client_id": user.client_id,
         "vendor_id": user.vendor_id,
         "parent_user_id": user.parent_user_id,
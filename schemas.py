@@ -106,8 +106,9 @@ class BusinessPartnerBase(BaseModel):
     def validate_pan_format(cls, v):
         """Validate PAN format."""
         try:
-            validate_pan(v)
-            return sanitize_pan(v)
+            v = sanitize_pan(v)
+            validate_pan(v, normalized=True)
+            return v
         except ValidationError as e:
             raise ValueError(str(e))
     
@@ -117,8 +118,9 @@ class BusinessPartnerBase(BaseModel):
         """Validate GSTIN format."""
         if v:
             try:
-                validate_gstin(v)
-                return sanitize_gstin(v)
+                v = sanitize_gstin(v)
+                validate_gstin(v, normalized=True)
+                return v
             except ValidationError as e:
                 raise ValueError(str(e))
         return v
@@ -149,8 +151,9 @@ class BusinessPartnerBase(BaseModel):
         """Validate IFSC code format."""
         if v:
             try:
-                validate_ifsc(v)
-                return sanitize_ifsc(v)
+                v = sanitize_ifsc(v)
+                validate_ifsc(v, normalized=True)
+                return v
             except ValidationError as e:
                 raise ValueError(str(e))
         return v
@@ -12,14 +12,10 @@ import uuid
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
 import models
 import schemas
-
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import utils
 
 
 class UserService:
@@ -36,7 +32,7 @@ class UserService:
         Returns:
             Hashed password
         """
-        return pwd_context.hash(password)
+        return utils.hash_password(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -50,7 +46,7 @@ class UserService:
         Returns:
             True if password matches, False otherwise
         """
-        return pwd_context.verify(plain_password, hashed_password)
+        return utils.verify_password(plain_password, hashed_password)
 
     @staticmethod
     def validate_email_unique(db: Session, email: str, exclude_id: Optional[str] = None) -> None:
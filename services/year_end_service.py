@@ -9,9 +9,11 @@ This module handles year-end operations including:
 - Calculation of opening balances
 - Complete year-end closing process
 """
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, text
+from sqlalchemy.exc import DBAPIError
 from models import (
     Invoice, Payment, Commission, Dispute,
     FinancialYear, YearEndTransfer
@@ -20,9 +22,140 @@ from datetime import datetime
 import uuid
 
 
+# Statuses that are carried forward into the next financial year
+_PENDING_INVOICE_STATUSES = ('Unpaid', 'Partially Paid')
+_DUE_COMMISSION_STATUS = 'Due'
+_OPEN_DISPUTE_STATUS = 'Open'
+
+# Summaries recorded on the corresponding YearEndTransfer log rows
+_PENDING_INVOICE_SUMMARY = {'status': list(_PENDING_INVOICE_STATUSES)}
+_DUE_COMMISSION_SUMMARY = {'status': _DUE_COMMISSION_STATUS}
+_OPEN_DISPUTE_SUMMARY = {'status': _OPEN_DISPUTE_STATUS}
+
+# Run complete year-end closing through the year_end_close() PostgreSQL
+# function (migrations/002_year_end_close_function.sql) in one round trip
+YEAR_END_DB_FUNCTION = os.getenv("YEAR_END_DB_FUNCTION", "false").lower() == "true"
+
+
 class YearEndService:
     """Service for year-end closing and data transfer operations."""
 
+    @staticmethod
+    def _get_financial_years(
+        db: Session,
+        from_fy_id: int,
+        to_fy_id: int
+    ) -> Tuple[FinancialYear, FinancialYear]:
+        """Load source and target financial years, raising if either is missing."""
+        from_fy = db.query(FinancialYear).filter(FinancialYear.id == from_fy_id).first()
+        to_fy = db.query(FinancialYear).filter(FinancialYear.id == to_fy_id).first()
+        
+        if not from_fy or not to_fy:
+            raise ValueError("Invalid financial year IDs")
+        
+        return from_fy, to_fy
+
+    @staticmethod
+    def _transfer_log(
+        from_fy: FinancialYear,
+        to_fy: FinancialYear,
+        organization_id: int,
+        performed_by: str,
+        transfer_type: str,
+        entity_type: str,
+        entity_count: int,
+        transfer_summary: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the column values for a YearEndTransfer log row."""
+        return {
+            'organization_id': organization_id,
+            'from_financial_year_id': from_fy.id,
+            'to_financial_year_id': to_fy.id,
+            'transfer_type': transfer_type,
+            'entity_type': entity_type,
+            'entity_count': entity_count,
+            'transfer_summary': transfer_summary,
+            'performed_by': performed_by
+        }
+
+    @staticmethod
+    def _transfer_pending_invoices(
+        db: Session,
+        from_fy: FinancialYear,
+        to_fy: FinancialYear,
+        organization_id: int,
+        performed_by: str
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Move pending invoices without committing; returns (count, log row)."""
+        # Move pending invoices to the new financial year in a single UPDATE
+        count = db.query(Invoice).filter(
+            and_(
+                Invoice.organization_id == organization_id,
+                Invoice.financial_year == from_fy.year_code,
+                Invoice.status.in_(_PENDING_INVOICE_STATUSES)
+            )
+        ).update(
+            {Invoice.financial_year: to_fy.year_code},
+            synchronize_session=False
+        )
+        
+        return count, YearEndService._transfer_log(
+            from_fy, to_fy, organization_id, performed_by,
+            'pending_invoices', 'invoice', count, _PENDING_INVOICE_SUMMARY
+        )
+
+    @staticmethod
+    def _transfer_due_commissions(
+        db: Session,
+        from_fy: FinancialYear,
+        to_fy: FinancialYear,
+        organization_id: int,
+        performed_by: str
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Move due commissions without committing; returns (count, log row)."""
+        # Move due commissions to the new financial year in a single UPDATE
+        count = db.query(Commission).filter(
+            and_(
+                Commission.organization_id == organization_id,
+                Commission.financial_year == from_fy.year_code,
+                Commission.status == _DUE_COMMISSION_STATUS
+            )
+        ).update(
+            {Commission.financial_year: to_fy.year_code},
+            synchronize_session=False
+        )
+        
+        return count, YearEndService._transfer_log(
+            from_fy, to_fy, organization_id, performed_by,
+            'pending_commissions', 'commission', count, _DUE_COMMISSION_SUMMARY
+        )
+
+    @staticmethod
+    def _transfer_open_disputes(
+        db: Session,
+        from_fy: FinancialYear,
+        to_fy: FinancialYear,
+        organization_id: int,
+        performed_by: str
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Move open disputes without committing; returns (count, log row)."""
+        # Move open disputes to the new financial year in a single UPDATE
+        count = db.query(Dispute).filter(
+            and_(
+                Dispute.organization_id == organization_id,
+                Dispute.financial_year == from_fy.year_code,
+                Dispute.status == _OPEN_DISPUTE_STATUS
+            )
+        ).update(
+            {Dispute.financial_year: to_fy.year_code},
+            synchronize_session=False
+        )
+        
+        return count, YearEndService._transfer_log(
+            from_fy, to_fy, organization_id, performed_by,
+            'open_disputes', 'dispute', count, _OPEN_DISPUTE_SUMMARY
+        )
+
     @staticmethod
     def transfer_pending_invoices(
         db: Session,
@@ -44,41 +177,14 @@ class YearEndService:
         Returns:
             Count of invoices transferred
         """
-        # Get financial years
-        from_fy = db.query(FinancialYear).filter(FinancialYear.id == from_fy_id).first()
-        to_fy = db.query(FinancialYear).filter(FinancialYear.id == to_fy_id).first()
-        
-        if not from_fy or not to_fy:
-            raise ValueError("Invalid financial year IDs")
-        
-        # Get pending invoices (Unpaid or Partially Paid)
-        pending_invoices = db.query(Invoice).filter(
-            and_(
-                Invoice.organization_id == organization_id,
-                Invoice.financial_year == from_fy.year_code,
-                Invoice.status.in_(['Unpaid', 'Partially Paid'])
-            )
-        ).all()
-        
-        # Update financial year for pending invoices
-        count = 0
-        for invoice in pending_invoices:
-            invoice.financial_year = to_fy.year_code
-            count += 1
+        from_fy, to_fy = YearEndService._get_financial_years(db, from_fy_id, to_fy_id)
         
-        # Log transfer
-        transfer = YearEndTransfer(
-            organization_id=organization_id,
-            from_financial_year_id=from_fy_id,
-            to_financial_year_id=to_fy_id,
-            transfer_type='pending_invoices',
-            entity_type='invoice',
-            entity_count=count,
-            transfer_summary={'status': ['Unpaid', 'Partially Paid']},
-            performed_by=performed_by
+        count, log = YearEndService._transfer_pending_invoices(
+            db, from_fy, to_fy, organization_id, performed_by
         )
         
-        db.add(transfer)
+        # Log transfer
+        db.add(YearEndTransfer(**log))
         db.commit()
         
         return count
@@ -92,40 +198,14 @@ class YearEndService:
         performed_by: str
     ) -> int:
         """Transfer due commissions to new financial year."""
-        from_fy = db.query(FinancialYear).filter(FinancialYear.id == from_fy_id).first()
-        to_fy = db.query(FinancialYear).filter(FinancialYear.id == to_fy_id).first()
-        
-        if not from_fy or not to_fy:
-            raise ValueError("Invalid financial year IDs")
+        from_fy, to_fy = YearEndService._get_financial_years(db, from_fy_id, to_fy_id)
         
-        # Get due commissions
-        due_commissions = db.query(Commission).filter(
-            and_(
-                Commission.organization_id == organization_id,
-                Commission.financial_year == from_fy.year_code,
-                Commission.status == 'Due'
-            )
-        ).all()
-        
-        # Update financial year
-        count = 0
-        for commission in due_commissions:
-            commission.financial_year = to_fy.year_code
-            count += 1
-        
-        # Log transfer
-        transfer = YearEndTransfer(
-            organization_id=organization_id,
-            from_financial_year_id=from_fy_id,
-            to_financial_year_id=to_fy_id,
-            transfer_type='pending_commissions',
-            entity_type='commission',
-            entity_count=count,
-            transfer_summary={'status': 'Due'},
-            performed_by=performed_by
+        count, log = YearEndService._transfer_due_commissions(
+            db, from_fy, to_fy, organization_id, performed_by
         )
         
-        db.add(transfer)
+        # Log transfer
+        db.add(YearEndTransfer(**log))
         db.commit()
         
         return count
@@ -139,61 +219,25 @@ class YearEndService:
         performed_by: str
     ) -> int:
         """Transfer open disputes to new financial year."""
-        from_fy = db.query(FinancialYear).filter(FinancialYear.id == from_fy_id).first()
-        to_fy = db.query(FinancialYear).filter(FinancialYear.id == to_fy_id).first()
-        
-        if not from_fy or not to_fy:
-            raise ValueError("Invalid financial year IDs")
+        from_fy, to_fy = YearEndService._get_financial_years(db, from_fy_id, to_fy_id)
         
-        # Get open disputes
-        open_disputes = db.query(Dispute).filter(
-            and_(
-                Dispute.organization_id == organization_id,
-                Dispute.financial_year == from_fy.year_code,
-                Dispute.status == 'Open'
-            )
-        ).all()
-        
-        # Update financial year
-        count = 0
-        for dispute in open_disputes:
-            dispute.financial_year = to_fy.year_code
-            count += 1
-        
-        # Log transfer
-        transfer = YearEndTransfer(
-            organization_id=organization_id,
-            from_financial_year_id=from_fy_id,
-            to_financial_year_id=to_fy_id,
-            transfer_type='open_disputes',
-            entity_type='dispute',
-            entity_count=count,
-            transfer_summary={'status': 'Open'},
-            performed_by=performed_by
+        count, log = YearEndService._transfer_open_disputes(
+            db, from_fy, to_fy, organization_id, performed_by
         )
         
-        db.add(transfer)
+        # Log transfer
+        db.add(YearEndTransfer(**log))
         db.commit()
         
         return count
 
     @staticmethod
-    def calculate_opening_balances(
+    def _opening_balances(
         db: Session,
-        financial_year_id: int,
+        fy: FinancialYear,
         organization_id: int
     ) -> Dict[str, Any]:
-        """
-        Calculate opening balances for new financial year.
-        
-        Returns:
-            Dict with opening balance details
-        """
-        fy = db.query(FinancialYear).filter(FinancialYear.id == financial_year_id).first()
-        
-        if not fy:
-            raise ValueError("Invalid financial year ID")
-        
+        """Compute and store opening balances on ``fy`` without committing."""
         # Calculate total outstanding invoices
         outstanding_invoices = db.query(Invoice).filter(
             and_(
@@ -210,7 +254,7 @@ class YearEndService:
             and_(
                 Commission.organization_id == organization_id,
                 Commission.financial_year == fy.year_code,
-                Commission.status == 'Due'
+                Commission.status == _DUE_COMMISSION_STATUS
             )
         ).all()
         
@@ -225,10 +269,69 @@ class YearEndService:
         
         # Update financial year opening balances
         fy.opening_balances = opening_balances
+        
+        return opening_balances
+
+    @staticmethod
+    def calculate_opening_balances(
+        db: Session,
+        financial_year_id: int,
+        organization_id: int
+    ) -> Dict[str, Any]:
+        """
+        Calculate opening balances for new financial year.
+        
+        Returns:
+            Dict with opening balance details
+        """
+        fy = db.query(FinancialYear).filter(FinancialYear.id == financial_year_id).first()
+        
+        if not fy:
+            raise ValueError("Invalid financial year ID")
+        
+        opening_balances = YearEndService._opening_balances(db, fy, organization_id)
         db.commit()
         
         return opening_balances
 
+    @staticmethod
+    def _use_db_function(db: Session) -> bool:
+        """Whether complete closing should run through year_end_close()."""
+        return YEAR_END_DB_FUNCTION and db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def _close_with_db_function(
+        db: Session,
+        from_fy: FinancialYear,
+        to_fy: FinancialYear,
+        organization_id: int,
+        performed_by: str
+    ) -> Dict[str, Any]:
+        """Run complete closing server-side; rolls back and re-raises on DB errors."""
+        try:
+            summary = db.execute(
+                text(
+                    "SELECT year_end_close(:from_fy_id, :to_fy_id, :organization_id, :performed_by, "
+                    ":invoice_statuses, :commission_status, :dispute_status)"
+                ),
+                {
+                    'from_fy_id': from_fy.id,
+                    'to_fy_id': to_fy.id,
+                    'organization_id': organization_id,
+                    'performed_by': performed_by,
+                    # A list, not a tuple, so psycopg2 sends a PostgreSQL array
+                    'invoice_statuses': list(_PENDING_INVOICE_STATUSES),
+                    'commission_status': _DUE_COMMISSION_STATUS,
+                    'dispute_status': _OPEN_DISPUTE_STATUS
+                }
+            ).scalar()
+            db.commit()
+        except DBAPIError:
+            db.rollback()
+            raise
+        
+        return summary
+
     @staticmethod
     def complete_year_end_closing(
         db: Session,
@@ -248,6 +351,11 @@ class YearEndService:
         5. Closes old financial year
         6. Activates new financial year
         
+        All steps run in a single transaction: the three transfer log rows
+        are written with one multi-row INSERT and the session is committed
+        once at the end. On PostgreSQL with YEAR_END_DB_FUNCTION enabled the
+        whole process runs server-side via the year_end_close() function.
+        
         Args:
             db: Database session
             from_fy_id: Source FY ID
@@ -257,32 +365,41 @@ class YearEndService:
             
         Returns:
             Summary dict with all transfer counts
+            
+        Raises:
+            ValueError: If either financial year is missing
         """
+        from_fy, to_fy = YearEndService._get_financial_years(db, from_fy_id, to_fy_id)
+        
+        if YearEndService._use_db_function(db):
+            return YearEndService._close_with_db_function(
+                db, from_fy, to_fy, organization_id, performed_by
+            )
+        
         # Transfer data
-        invoices_transferred = YearEndService.transfer_pending_invoices(
-            db, from_fy_id, to_fy_id, organization_id, performed_by
+        invoices_transferred, invoice_log = YearEndService._transfer_pending_invoices(
+            db, from_fy, to_fy, organization_id, performed_by
         )
         
-        commissions_transferred = YearEndService.transfer_due_commissions(
-            db, from_fy_id, to_fy_id, organization_id, performed_by
+        commissions_transferred, commission_log = YearEndService._transfer_due_commissions(
+            db, from_fy, to_fy, organization_id, performed_by
         )
         
-        disputes_transferred = YearEndService.transfer_open_disputes(
-            db, from_fy_id, to_fy_id, organization_id, performed_by
+        disputes_transferred, dispute_log = YearEndService._transfer_open_disputes(
+            db, from_fy, to_fy, organization_id, performed_by
         )
         
+        # Log all transfers in one statement
+        db.execute(insert(YearEndTransfer), [invoice_log, commission_log, dispute_log])
+        
         # Calculate opening balances
-        opening_balances = YearEndService.calculate_opening_balances(
-            db, to_fy_id, organization_id
-        )
+        opening_balances = YearEndService._opening_balances(db, to_fy, organization_id)
         
         # Close old FY
-        from_fy = db.query(FinancialYear).filter(FinancialYear.id == from_fy_id).first()
         from_fy.is_closed = True
         from_fy.is_active = False
         
         # Activate new FY
-        to_fy = db.query(FinancialYear).filter(FinancialYear.id == to_fy_id).first()
         to_fy.is_active = True
         
         db.commit()
@@ -5,67 +5,88 @@ This test verifies that when database connection fails during session creation,
 the get_db() dependency properly handles the error and returns a 503 status code.
 """
 import pytest
-from unittest.mock import patch, MagicMock
-from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock, create_autospec
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query, Session
 
+# Raised by mocked queries when simulating a dropped database connection
+_CONN_LOST_ERR = OperationalError(
+    "database connection lost",
+    params=None,
+    orig=Exception("Connection lost")
+)
 
-def test_database_connection_error_handling():
+# Query mock built once from the Query class; each chained call returns it
+_QUERY_SPEC = create_autospec(Query, instance=True)
+for _method in (_QUERY_SPEC.options, _QUERY_SPEC.filter, _QUERY_SPEC.offset, _QUERY_SPEC.limit):
+    _method.return_value = _QUERY_SPEC
+
+
+def test_database_connection_error_handling(client, broken_session_local):
     """
     Test that database connection errors during session creation
     are properly handled and return 503 Service Unavailable with CORS headers.
     """
-    from main import app
-    from database import SessionLocal
+    # Try to access an endpoint that uses get_db()
+    response = client.get("/api/settings/users")
     
-    client = TestClient(app)
+    # Should return 503 Service Unavailable, not 500
+    assert response.status_code == 503
+    assert "Database connection unavailable" in response.json()["detail"]
     
-    # Mock SessionLocal to raise an OperationalError (simulating connection failure)
-    with patch('database.SessionLocal') as mock_session:
-        mock_session.side_effect = OperationalError(
-            "could not connect to server",
-            params=None,
-            orig=Exception("Connection refused")
-        )
-        
-        # Try to access an endpoint that uses get_db()
-        response = client.get("/api/settings/users")
-        
-        # Should return 503 Service Unavailable, not 500
-        assert response.status_code == 503
-        assert "Database connection unavailable" in response.json()["detail"]
-        
-        # Verify CORS headers are present
-        assert "access-control-allow-origin" in response.headers
-        assert response.headers["access-control-allow-origin"] == "*"
+    # Verify CORS headers are present
+    assert "access-control-allow-origin" in response.headers
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def _raising_session():
+    """Yield a session whose user queries fail as if the connection dropped."""
+    _QUERY_SPEC.reset_mock()
+    _QUERY_SPEC.all.side_effect = _CONN_LOST_ERR
+    session = MagicMock(spec=Session)
+    session.query.return_value = _QUERY_SPEC
+    yield session
+
+
+def _get_with_raising_session(client, path):
+    """GET path with the routes' get_db dependency yielding _raising_session."""
+    from main import app
+    from routes_complete import get_db
+    
+    app.dependency_overrides[get_db] = _raising_session
+    try:
+        return client.get(path)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
 
 
-def test_database_session_error_during_query():
+def test_database_session_error_during_query(client):
     """
     Test that errors during query execution are properly handled.
     """
-    from main import app
+    response = _get_with_raising_session(client, "/api/settings/users")
     
-    client = TestClient(app)
+    # The stub's failing query was actually run
+    _QUERY_SPEC.all.assert_called_once()
     
-    # Mock the User model query to raise an error
-    with patch('models.User') as mock_user:
-        # Create a mock query that raises an error
-        mock_query = MagicMock()
-        mock_query.options.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.side_effect = OperationalError(
-            "database connection lost",
-            params=None,
-            orig=Exception("Connection lost")
-        )
-        
-        # This test would require more complex mocking setup
-        # For now, we just verify the endpoint exists
-        response = client.get("/health")
-        assert response.status_code == 200
+    # The endpoint reports its own failures as a JSON 500 with CORS headers
+    assert response.status_code == 500
+    assert response.json()["detail"].startswith("Failed to retrieve users")
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_unhandled_operational_error_returns_503(client):
+    """
+    Test that an OperationalError a route does not handle becomes a generic 503.
+    """
+    response = _get_with_raising_session(client, "/api/users/")
+    
+    _QUERY_SPEC.all.assert_called_once()
+    
+    # The app-wide handler hides the driver's error text from the client
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Database connection unavailable. Please try again later."
+    assert response.headers["access-control-allow-origin"] == "*"
 
 
 def test_get_db_successful_session_creation():
@@ -74,27 +95,16 @@ def test_get_db_successful_session_creation():
     """
     from database import get_db
     
-    # Create a generator
-    db_gen = get_db()
-    
-    try:
-        # Get the session
-        db = next(db_gen)
+    with patch('database.SessionLocal', return_value=MagicMock(spec=Session)) as mock_session_local:
+        db_gen = get_db()
         
-        # Verify we got a session object
-        assert db is not None
+        # The yielded session is the one SessionLocal created
+        db = next(db_gen)
+        assert db is mock_session_local.return_value
         
-        # Clean up
-        db_gen.send(None)
-    except StopIteration:
-        # Generator properly closed
-        pass
-    except Exception as e:
-        # If we get an HTTPException with status 503, that's expected if DB is not available
-        if hasattr(e, 'status_code') and e.status_code == 503:
-            pytest.skip("Database not available for this test")
-        else:
-            raise
+        # Closing the generator closes the session
+        db_gen.close()
+        db.close.assert_called_once()
 
 
 if __name__ == "__main__":
@@ -5,10 +5,8 @@ This test verifies that database operations handle errors properly,
 including connection errors, integrity errors, and operational errors.
 """
 import pytest
-from unittest.mock import patch, MagicMock
-from fastapi.testclient import TestClient
+from fastapi import HTTPException
 from sqlalchemy.exc import (
-    OperationalError,
     IntegrityError,
     DatabaseError
 )
@@ -56,31 +54,22 @@ def test_database_connection_resilience():
     print(f"  pool_recycle: {database.engine.pool._recycle}s")
 
 
-def test_database_session_error_handling():
+def test_database_session_error_handling(broken_session_local):
     """
     Test that database session errors are properly handled in get_db().
     """
     from database import get_db
-    from fastapi import HTTPException
-    
-    # Mock SessionLocal to raise an error
-    with patch('database.SessionLocal') as mock_session:
-        mock_session.side_effect = OperationalError(
-            "could not connect to server",
-            params=None,
-            orig=Exception("Connection refused")
-        )
-        
-        # Create the generator
-        db_gen = get_db()
-        
-        # Try to get the session - should raise HTTPException with 503
-        with pytest.raises(HTTPException) as exc_info:
-            next(db_gen)
-        
-        assert exc_info.value.status_code == 503
-        assert "Database connection unavailable" in str(exc_info.value.detail)
-        
+    
+    # Create the generator
+    db_gen = get_db()
+    
+    # Try to get the session - should raise HTTPException with 503
+    with pytest.raises(HTTPException) as exc_info:
+        next(db_gen)
+    
+    assert exc_info.value.status_code == 503
+    assert "Database connection unavailable" in str(exc_info.value.detail)
+    
     print("✓ Database session creation errors are properly handled")
 
 
@@ -118,14 +107,10 @@ def test_database_operation_rollback():
             raise
 
 
-def test_endpoint_database_error_handling():
+def test_endpoint_database_error_handling(client):
     """
     Test that API endpoints handle database errors gracefully.
     """
-    from main import app
-    
-    client = TestClient(app)
-    
     # Test health endpoint (should work even if DB operations fail)
     response = client.get("/health")
     
@@ -7,73 +7,33 @@ not the enum representation like "UserType.PRIMARY".
 import sys
 from enum import Enum as PyEnum
 
+import pytest
 
-def test_enum_conversion_logic():
-    """Test the enum conversion logic used in the endpoints."""
-    print("=" * 70)
-    print("Testing Enum Serialization Logic")
-    print("=" * 70)
-    
-    # Define test enum (similar to what might be in the database)
-    class UserType(PyEnum):
-        PRIMARY = 'primary'
-        SUB_USER = 'sub_user'
-    
-    # Test cases
-    test_cases = [
-        ("String value (PostgreSQL)", "primary", "primary"),
-        ("Python Enum", UserType.PRIMARY, "primary"),
-        ("Python Enum SUB_USER", UserType.SUB_USER, "sub_user"),
-    ]
-    
-    print("\nTesting CORRECTED logic: value if hasattr(x, 'value') else str(x)")
-    all_passed = True
-    
-    for name, input_val, expected in test_cases:
-        # This is the CORRECTED logic
-        result = input_val.value if hasattr(input_val, 'value') else str(input_val)
-        
-        status = "✓" if result == expected else "✗"
-        if result != expected:
-            all_passed = False
-        
-        print(f"\n  {status} {name}:")
-        print(f"      Input:    {input_val} ({type(input_val).__name__})")
-        print(f"      Expected: {expected}")
-        print(f"      Got:      {result}")
-        print(f"      Match:    {result == expected}")
-    
-    print("\n" + "=" * 70)
-    
-    # Also test the OLD BUGGY logic to show the difference
-    print("\nTesting OLD BUGGY logic: str(x) if hasattr(x, 'value') else x")
-    print("(This would have caused the 500 error)")
-    
-    for name, input_val, expected in test_cases:
-        # This is the OLD BUGGY logic
-        result = str(input_val) if hasattr(input_val, 'value') else input_val
-        
-        status = "✓" if result == expected else "✗"
-        
-        print(f"\n  {status} {name}:")
-        print(f"      Input:    {input_val} ({type(input_val).__name__})")
-        print(f"      Expected: {expected}")
-        print(f"      Got:      {result}")
-        if result != expected:
-            print(f"      ⚠️  BUG! This would cause serialization error")
-    
-    print("\n" + "=" * 70)
-    
-    if all_passed:
-        print("✅ CORRECTED logic handles all cases correctly!")
-        print("=" * 70)
-        return True
-    else:
-        print("❌ CORRECTED logic has issues!")
-        print("=" * 70)
-        return False
+from utils import enum_value
+
+
+# Define test enum (similar to what might be in the database)
+class UserType(PyEnum):
+    PRIMARY = 'primary'
+    SUB_USER = 'sub_user'
+    UNSET = ''
+
+
+# (name, input value, expected serialized string)
+_ENUM_CASES = (
+    ("String value (PostgreSQL)", "primary", "primary"),
+    ("Python Enum", UserType.PRIMARY, "primary"),
+    ("Python Enum SUB_USER", UserType.SUB_USER, "sub_user"),
+    # A falsy value is still the member's value, not "UserType.UNSET"
+    ("Python Enum with empty value", UserType.UNSET, ""),
+)
+
+
+@pytest.mark.parametrize("name,input_val,expected", _ENUM_CASES, ids=[case[0] for case in _ENUM_CASES])
+def test_enum_conversion_logic(name, input_val, expected):
+    """Test the enum conversion helper used by the endpoints."""
+    assert enum_value(input_val) == expected
 
 
 if __name__ == "__main__":
-    success = test_enum_conversion_logic()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
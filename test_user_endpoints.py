@@ -4,118 +4,74 @@ Test to verify /api/users endpoints are registered correctly.
 import sys
 import os
 
+import pytest
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
+import models
+import schemas
 from routes_complete import user_router
 
 
 def test_user_routes_registered():
     """Test that /api/users routes are registered correctly."""
-    print("Testing /api/users routes registration...")
-    print("=" * 60)
-    
-    app = FastAPI()
-    app.include_router(user_router)
-    
-    # Get all routes that include /api/users
-    user_routes = []
-    for route in app.routes:
-        if hasattr(route, 'path') and '/api/users' in route.path:
-            methods = getattr(route, 'methods', set())
-            if methods:
-                for method in methods:
-                    user_routes.append((method, route.path))
+    # Read the router's own route table: newer FastAPI releases keep an
+    # included router as a single entry in app.routes instead of copying
+    # its routes, so the router is the reliable source.
+    user_routes = frozenset(
+        (method, route.path)
+        for route in user_router.routes
+        if getattr(route, 'path', '').startswith('/api/users')
+        for method in getattr(route, 'methods', None) or ()
+    )
     
-    # Expected routes
-    expected_routes = [
+    expected_routes = {
         ('GET', '/api/users/'),
         ('POST', '/api/users/'),
         ('GET', '/api/users/{user_id}'),
         ('PUT', '/api/users/{user_id}'),
         ('DELETE', '/api/users/{user_id}'),
-    ]
-    
-    print("\nExpected Routes:")
-    for method, path in expected_routes:
-        print(f"  {method:<8} {path}")
+    }
     
-    print("\nActual Routes:")
-    for method, path in sorted(user_routes):
-        print(f"  {method:<8} {path}")
-    
-    print("\nVerifying required routes exist:")
-    success = True
-    for method, path in expected_routes:
-        if (method, path) in user_routes:
-            print(f"  ✓ {method:<8} {path}")
-        else:
-            print(f"  ✗ {method:<8} {path} - MISSING!")
-            success = False
-    
-    print("\n" + "=" * 60)
-    if success:
-        print("✓ ALL REQUIRED USER ROUTES ARE REGISTERED")
-    else:
-        print("✗ SOME ROUTES ARE MISSING")
-    print("=" * 60)
-    return success
+    assert expected_routes <= user_routes, f"Missing routes: {sorted(expected_routes - user_routes)}"
 
 
 def test_schemas_importable():
     """Test that UserUpdate schema is importable."""
-    print("\nTesting user schemas...")
-    print("=" * 60)
+    required_schemas = [
+        'UserCreate',
+        'UserUpdate',
+        'UserResponse',
+        'UserRole'
+    ]
     
-    try:
-        import schemas
-        
-        # Check if schemas exist
-        required_schemas = [
-            'UserCreate',
-            'UserUpdate',
-            'UserResponse',
-            'UserRole'
-        ]
-        
-        print("\nVerifying schemas:")
-        success = True
-        for schema_name in required_schemas:
-            if hasattr(schemas, schema_name):
-                print(f"  ✓ {schema_name}")
-            else:
-                print(f"  ✗ {schema_name} - MISSING!")
-                success = False
-        
-        print("\n" + "=" * 60)
-        if success:
-            print("✓ ALL USER SCHEMAS ARE AVAILABLE")
-        else:
-            print("✗ SOME SCHEMAS ARE MISSING")
-        print("=" * 60)
-        return success
-        
-    except Exception as e:
-        print(f"\n✗ ERROR: {e}")
-        return False
+    missing = [name for name in required_schemas if not hasattr(schemas, name)]
+    assert not missing, f"Missing schemas: {missing}"
 
 
-if __name__ == "__main__":
-    success = True
-    success = test_user_routes_registered() and success
-    success = test_schemas_importable() and success
+def test_db_client_overrides_route_dependency(db_client):
+    """Test that db_client's override is keyed on the dependency GET /api/users/ uses."""
+    from main import app
     
-    if success:
-        print("\n" + "=" * 60)
-        print("✅ ALL TESTS PASSED - /api/users ENDPOINTS ARE READY!")
-        print("=" * 60)
-        print("\nThe following endpoints are now available:")
-        print("  GET    /api/users/")
-        print("  POST   /api/users/")
-        print("  GET    /api/users/{user_id}")
-        print("  PUT    /api/users/{user_id}")
-        print("  DELETE /api/users/{user_id}")
-        print("=" * 60)
-    else:
-        print("\n❌ SOME TESTS FAILED")
-        sys.exit(1)
+    route = next(
+        route for route in user_router.routes
+        if route.path == '/api/users/' and 'GET' in route.methods
+    )
+    route_deps = {dependency.call for dependency in route.dependant.dependencies}
+    
+    assert route_deps & app.dependency_overrides.keys()
+
+
+def test_list_users_reads_from_database(db_client, db):
+    """Test that GET /api/users/ returns users stored through the session."""
+    db.add(models.User(name="Listed User", email="listed@example.com", password_hash="hashed_password"))
+    db.commit()
+
+    response = db_client.get("/api/users/")
+
+    assert response.status_code == 200
+    assert [user["email"] for user in response.json()] == ["listed@example.com"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
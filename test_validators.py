@@ -0,0 +1,87 @@
+"""
+Tests for the Indian identifier and contact validators.
+
+validators.py compiles its patterns with google-re2 when it is installed
+and with re otherwise. Every test runs against a private copy of the
+module loaded with each engine, so both must give the same answers.
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_VALIDATORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "validators.py")
+
+
+@pytest.fixture(params=["re", "re2"])
+def validators(request, monkeypatch):
+    """Load a fresh copy of validators.py that compiles its patterns with the given engine."""
+    engine = request.param
+    if engine == "re2":
+        pytest.importorskip("re2")
+    else:
+        # A None entry makes `import re2` raise ImportError
+        monkeypatch.setitem(sys.modules, "re2", None)
+
+    spec = importlib.util.spec_from_file_location(f"_validators_{engine}", _VALIDATORS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module._regex.__name__ == engine
+    return module
+
+
+@pytest.mark.parametrize("mobile", [
+    "9876543210",
+    "+91 98765 43210",
+    "(98765)-43210",
+    "919876543210",
+    # NBSP is whitespace to re's \s, not to RE2's
+    "98765\xa043210",
+])
+def test_validate_mobile_accepts(validators, mobile):
+    """Test that valid mobile numbers pass, including Unicode whitespace separators."""
+    assert validators.validate_mobile(mobile) is True
+
+
+@pytest.mark.parametrize("mobile", ["5876543210", "98765", "98765x43210"])
+def test_validate_mobile_rejects(validators, mobile):
+    """Test that malformed mobile numbers are rejected."""
+    with pytest.raises(validators.ValidationError):
+        validators.validate_mobile(mobile)
+
+
+@pytest.mark.parametrize("mobile, expected", [
+    ("+91 98765-43210", "9876543210"),
+    ("(0) 98765 43210", "09876543210"),
+    # Non-ASCII input skips the str.translate fast path
+    ("98765\xa043210", "9876543210"),
+    ("+91\u200998765\u200943210", "9876543210"),
+    # Devanagari digits are decimal digits, so they are kept
+    ("\u096f\u096e\u096d\u096c\u096b\u096a\u0969\u0968\u0967\u0966",
+     "\u096f\u096e\u096d\u096c\u096b\u096a\u0969\u0968\u0967\u0966"),
+    ("", ""),
+])
+def test_sanitize_mobile(validators, mobile, expected):
+    """Test that sanitizing gives the same digits for ASCII and non-ASCII input."""
+    assert validators.sanitize_mobile(mobile) == expected
+
+
+def test_identifier_validators(validators):
+    """Test PAN, GSTIN, IFSC, email and pincode formats."""
+    assert validators.validate_pan(" abcde1234f ") is True
+    assert validators.validate_gstin("27ABCDE1234F1Z5") is True
+    assert validators.validate_ifsc("sbin0001234") is True
+    assert validators.validate_email("trader@example.com") is True
+    assert validators.validate_pincode("400001") is True
+
+    with pytest.raises(validators.ValidationError):
+        validators.validate_pan("ABCD1234F")
+    with pytest.raises(validators.ValidationError):
+        validators.validate_gstin("27ABCDE1234F1X5")
+    with pytest.raises(validators.ValidationError):
+        validators.validate_ifsc("SBIN1001234")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
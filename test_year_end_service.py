@@ -0,0 +1,250 @@
+"""
+Tests for the year-end closing service.
+
+These run YearEndService against the in-memory test database and check
+the rows it moves, the transfer log it writes and the financial year
+flags it sets.
+"""
+import os
+import sys
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import (
+    Commission, Dispute, FinancialYear, Invoice, Organization, YearEndTransfer
+)
+import services.year_end_service as year_end_service
+from services.year_end_service import YearEndService
+
+_ORG_ID = 1
+_PERFORMED_BY = "admin@example.com"
+
+
+def _new_id():
+    """Return a random primary key / reference number."""
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+def financial_years(db):
+    """Add an organization with an active FY 2023-24 and an upcoming FY 2024-25."""
+    db.add(Organization(id=_ORG_ID, legal_name="RNRL Ltd", display_name="RNRL", pan="AAAAA0000A"))
+    from_fy = FinancialYear(
+        organization_id=_ORG_ID, year_code="2023-24", assessment_year="2024-25",
+        start_date=datetime(2023, 4, 1), end_date=datetime(2024, 3, 31), is_active=True
+    )
+    to_fy = FinancialYear(
+        organization_id=_ORG_ID, year_code="2024-25", assessment_year="2025-26",
+        start_date=datetime(2024, 4, 1), end_date=datetime(2025, 3, 31)
+    )
+    db.add_all([from_fy, to_fy])
+    db.commit()
+    return from_fy, to_fy
+
+
+def _add_invoice(db, status, amount, financial_year="2023-24"):
+    """Add an invoice for the test organization; the caller commits."""
+    db.add(Invoice(
+        id=_new_id(), invoice_no=_new_id(), organization_id=_ORG_ID,
+        financial_year=financial_year, sales_contract_id=_new_id(),
+        date=datetime(2024, 1, 15), amount=amount, status=status
+    ))
+
+
+def _add_commission(db, status, amount, financial_year="2023-24"):
+    """Add a commission for the test organization; the caller commits."""
+    db.add(Commission(
+        id=_new_id(), commission_id=_new_id(), organization_id=_ORG_ID,
+        financial_year=financial_year, sales_contract_id=_new_id(),
+        agent="Agent", amount=amount, status=status
+    ))
+
+
+def _add_dispute(db, status, financial_year="2023-24"):
+    """Add a dispute for the test organization; the caller commits."""
+    db.add(Dispute(
+        id=_new_id(), dispute_id=_new_id(), organization_id=_ORG_ID,
+        financial_year=financial_year, sales_contract_id=_new_id(),
+        reason="Quality", status=status, date_raised=datetime(2024, 2, 1)
+    ))
+
+
+@pytest.fixture
+def pending_records(db, financial_years):
+    """Add records that are carried forward, and some that stay behind."""
+    _add_invoice(db, "Unpaid", 100.0)
+    _add_invoice(db, "Partially Paid", 50.0)
+    _add_invoice(db, "Paid", 75.0)
+    _add_commission(db, "Due", 10.0)
+    _add_commission(db, "Paid", 20.0)
+    _add_dispute(db, "Open")
+    _add_dispute(db, "Resolved")
+    db.commit()
+
+
+def _years_by_status(db, model):
+    """Return sorted (status, financial_year) pairs for every row of model."""
+    return sorted((row.status, row.financial_year) for row in db.query(model))
+
+
+def test_complete_year_end_closing_transfers_pending_records(db, financial_years, pending_records):
+    """Test that closing moves pending records, logs the transfers and flips the FY flags."""
+    from_fy, to_fy = financial_years
+
+    summary = YearEndService.complete_year_end_closing(
+        db, from_fy.id, to_fy.id, _ORG_ID, _PERFORMED_BY
+    )
+
+    assert summary["invoices_transferred"] == 2
+    assert summary["commissions_transferred"] == 1
+    assert summary["disputes_transferred"] == 1
+    assert summary["from_financial_year"] == "2023-24"
+    assert summary["to_financial_year"] == "2024-25"
+
+    # Only the pending rows point at the new financial year
+    assert _years_by_status(db, Invoice) == [
+        ("Paid", "2023-24"), ("Partially Paid", "2024-25"), ("Unpaid", "2024-25")
+    ]
+    assert _years_by_status(db, Commission) == [("Due", "2024-25"), ("Paid", "2023-24")]
+    assert _years_by_status(db, Dispute) == [("Open", "2024-25"), ("Resolved", "2023-24")]
+
+    transfers = {
+        row.transfer_type: row
+        for row in db.query(YearEndTransfer).filter(YearEndTransfer.organization_id == _ORG_ID)
+    }
+    assert {
+        transfer_type: (row.entity_type, row.entity_count, row.transfer_summary)
+        for transfer_type, row in transfers.items()
+    } == {
+        "pending_invoices": ("invoice", 2, {"status": ["Unpaid", "Partially Paid"]}),
+        "pending_commissions": ("commission", 1, {"status": "Due"}),
+        "open_disputes": ("dispute", 1, {"status": "Open"}),
+    }
+    for row in transfers.values():
+        assert (row.from_financial_year_id, row.to_financial_year_id) == (from_fy.id, to_fy.id)
+        assert row.performed_by == _PERFORMED_BY
+
+    db.refresh(from_fy)
+    db.refresh(to_fy)
+    assert (from_fy.is_closed, from_fy.is_active) == (True, False)
+    assert (to_fy.is_closed, to_fy.is_active) == (False, True)
+
+
+def test_transfer_pending_invoices_logs_one_transfer(db, financial_years, pending_records):
+    """Test the standalone invoice transfer and its YearEndTransfer row."""
+    from_fy, to_fy = financial_years
+
+    count = YearEndService.transfer_pending_invoices(
+        db, from_fy.id, to_fy.id, _ORG_ID, _PERFORMED_BY
+    )
+
+    assert count == 2
+    assert [(row.transfer_type, row.entity_count) for row in db.query(YearEndTransfer)] == [
+        ("pending_invoices", 2)
+    ]
+    # Commissions and disputes are left alone
+    assert _years_by_status(db, Commission) == [("Due", "2023-24"), ("Paid", "2023-24")]
+
+
+def test_calculate_opening_balances(db, financial_years, pending_records):
+    """Test that opening balances count unpaid invoices and due commissions only."""
+    from_fy, _ = financial_years
+
+    balances = YearEndService.calculate_opening_balances(db, from_fy.id, _ORG_ID)
+
+    assert balances == {
+        "outstanding_invoices": 150.0,
+        "due_commissions": 10.0,
+        "invoice_count": 2,
+        "commission_count": 1,
+    }
+    db.refresh(from_fy)
+    assert from_fy.opening_balances == balances
+
+
+def test_complete_year_end_closing_sets_opening_balances(db, financial_years, pending_records):
+    """Test that the new financial year opens with the balances carried forward."""
+    from_fy, to_fy = financial_years
+
+    summary = YearEndService.complete_year_end_closing(
+        db, from_fy.id, to_fy.id, _ORG_ID, _PERFORMED_BY
+    )
+
+    db.refresh(to_fy)
+    assert summary["opening_balances"] == to_fy.opening_balances == {
+        "outstanding_invoices": 150.0,
+        "due_commissions": 10.0,
+        "invoice_count": 2,
+        "commission_count": 1,
+    }
+
+
+def test_calculate_opening_balances_missing_financial_year(db):
+    """Test that an unknown financial year ID is rejected."""
+    with pytest.raises(ValueError, match="Invalid financial year ID"):
+        YearEndService.calculate_opening_balances(db, 999, _ORG_ID)
+
+
+@pytest.mark.parametrize("missing", ["from", "to"])
+def test_complete_year_end_closing_missing_financial_year(db, financial_years, missing):
+    """Test that closing is refused when either financial year does not exist."""
+    from_fy, to_fy = financial_years
+    from_fy_id = 999 if missing == "from" else from_fy.id
+    to_fy_id = 999 if missing == "to" else to_fy.id
+
+    with pytest.raises(ValueError, match="Invalid financial year IDs"):
+        YearEndService.complete_year_end_closing(db, from_fy_id, to_fy_id, _ORG_ID, _PERFORMED_BY)
+
+
+@pytest.mark.parametrize("enabled,dialect,expected", [
+    (True, "postgresql", True),
+    (True, "sqlite", False),
+    (False, "postgresql", False),
+])
+def test_use_db_function(monkeypatch, enabled, dialect, expected):
+    """Test that year_end_close() is only used on PostgreSQL with the flag set."""
+    monkeypatch.setattr(year_end_service, "YEAR_END_DB_FUNCTION", enabled)
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = dialect
+
+    assert YearEndService._use_db_function(session) is expected
+
+
+@pytest.fixture
+def db_function_enabled(monkeypatch):
+    """Route complete closing through year_end_close() whatever the dialect."""
+    monkeypatch.setattr(YearEndService, "_use_db_function", staticmethod(lambda db: True))
+
+
+def test_db_function_rejects_missing_financial_year(db, financial_years, db_function_enabled):
+    """Test that invalid IDs raise ValueError before the database function is called."""
+    from_fy, _ = financial_years
+
+    with pytest.raises(ValueError, match="Invalid financial year IDs"):
+        YearEndService.complete_year_end_closing(db, from_fy.id, 999, _ORG_ID, _PERFORMED_BY)
+
+
+def test_db_function_error_rolls_back(db, financial_years, db_function_enabled, monkeypatch):
+    """Test that a failing year_end_close() call is rolled back and re-raised."""
+    from_fy, to_fy = financial_years
+    rollback = MagicMock(wraps=db.rollback)
+    monkeypatch.setattr(db, "rollback", rollback)
+
+    # SQLite has no year_end_close(), so the call fails like a database error would
+    with pytest.raises(DBAPIError):
+        YearEndService.complete_year_end_closing(db, from_fy.id, to_fy.id, _ORG_ID, _PERFORMED_BY)
+
+    rollback.assert_called_once_with()
+    # The session is usable again and nothing was closed
+    assert db.query(FinancialYear).filter(FinancialYear.is_closed.is_(True)).count() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -3,8 +3,10 @@ Utility functions for RNRL TradeHub backend.
 
 This module contains reusable utility functions to eliminate code duplication.
 """
-from typing import Dict
-from passlib.context import CryptContext
+import os
+from typing import Any, Dict
+
+import bcrypt
 
 
 # CORS headers for exception responses
@@ -23,24 +25,12 @@ def get_cors_headers() -> Dict[str, str]:
     }
 
 
-# Password hashing context (singleton)
-_pwd_context = None
-
+# bcrypt cost factor; tests lower it through BCRYPT_ROUNDS to keep hashing fast
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
-def get_password_context() -> CryptContext:
-    """
-    Get or create the password hashing context.
-    
-    Uses bcrypt for secure password hashing. Context is created once
-    and reused for efficiency.
-    
-    Returns:
-        CryptContext: Password hashing context.
-    """
-    global _pwd_context
-    if _pwd_context is None:
-        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    return _pwd_context
+# bcrypt only uses the first 72 bytes of a password and the bcrypt package
+# rejects longer input, so passwords are truncated the way passlib did
+_BCRYPT_MAX_BYTES = 72
 
 
 def hash_password(password: str) -> str:
@@ -53,8 +43,8 @@ def hash_password(password: str) -> str:
     Returns:
         str: Hashed password.
     """
-    pwd_context = get_password_context()
-    return pwd_context.hash(password)
+    secret = password.encode("utf-8")[:_BCRYPT_MAX_BYTES]
+    return bcrypt.hashpw(secret, bcrypt.gensalt(BCRYPT_ROUNDS)).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -68,5 +58,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise.
     """
-    pwd_context = get_password_context()
-    return pwd_context.verify(plain_password, hashed_password)
+    secret = plain_password.encode("utf-8")[:_BCRYPT_MAX_BYTES]
+    return bcrypt.checkpw(secret, hashed_password.encode("utf-8"))
+
+
+def enum_value(value: Any) -> str:
+    """
+    Serialize an enum column value to its string form.
+    
+    PostgreSQL enum columns may load as plain strings or as Python Enum
+    members; either way the response should carry the raw value (e.g.
+    "primary"), not "UserType.PRIMARY".
+    
+    Args:
+        value: Enum member or plain value.
+        
+    Returns:
+        str: The member's value, or str(value) for anything without one.
+    """
+    return value.value if hasattr(value, 'value') else str(value)
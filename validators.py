@@ -9,15 +9,54 @@ Provides comprehensive validation for:
 - Pincode (Indian postal codes)
 """
 import re
+from functools import lru_cache
 from typing import Optional
 
+try:
+    # google-re2 matches in linear time; the ASCII-only patterns below use it
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+
+# Patterns are compiled once and matched with fullmatch(), so no ^/$ anchors
+_PAN_RE = _regex.compile(r'[A-Z]{5}[0-9]{4}[A-Z]')
+_GSTIN_RE = _regex.compile(r'[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][1-9A-Z]Z[0-9A-Z]')
+_MOBILE_RE = _regex.compile(r'[6-9][0-9]{9}')
+_EMAIL_RE = _regex.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_PINCODE_RE = _regex.compile(r'[1-9][0-9]{5}')
+_IFSC_RE = _regex.compile(r'[A-Z]{4}0[A-Z0-9]{6}')
+
+# \s and \D are Unicode-aware in re but ASCII-only in RE2, so these two
+# always use re to keep results independent of whether re2 is installed
+_MOBILE_CLEAN_RE = re.compile(r'[\s\-\(\)]')
+_NONDIGIT_RE = re.compile(r'\D')
+
+# Deletes every non-digit ASCII character in a single str.translate pass
+_ASCII_NONDIGITS = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isdecimal()))
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
 
-def validate_pan(pan: str) -> bool:
+# Bulk imports repeat the same partner identifiers across many rows
+_CACHE_SIZE = 4096
+
+
+def _norm(value: Optional[str]) -> Optional[str]:
+    """Strip and upper-case an identifier in one place; falsy values pass through."""
+    return value.strip().upper() if value else value
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _is_valid_pan(pan: str) -> bool:
+    """Match a normalized PAN against _PAN_RE, memoizing the result."""
+    return _PAN_RE.fullmatch(pan) is not None
+
+
+def validate_pan(pan: str, *, normalized: bool = False) -> bool:
     """
     Validate PAN (Permanent Account Number) format.
     
@@ -28,6 +67,7 @@ def validate_pan(pan: str) -> bool:
     
     Args:
         pan: PAN string to validate
+        normalized: True if pan is already stripped and upper-cased
         
     Returns:
         True if valid
@@ -38,12 +78,11 @@ def validate_pan(pan: str) -> bool:
     if not pan:
         raise ValidationError("PAN cannot be empty")
     
-    pan = pan.strip().upper()
+    if not normalized:
+        pan = _norm(pan)
     
     # PAN format: AAAAA9999A
-    pattern = r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$'
-    
-    if not re.match(pattern, pan):
+    if not _is_valid_pan(pan):
         raise ValidationError(
             f"Invalid PAN format: {pan}. "
             "Expected format: AAAAA9999A (e.g., ABCDE1234F)"
@@ -52,7 +91,7 @@ def validate_pan(pan: str) -> bool:
     return True
 
 
-def validate_gstin(gstin: Optional[str]) -> bool:
+def validate_gstin(gstin: Optional[str], *, normalized: bool = False) -> bool:
     """
     Validate GSTIN (GST Identification Number) format.
     
@@ -65,6 +104,7 @@ def validate_gstin(gstin: Optional[str]) -> bool:
     
     Args:
         gstin: GSTIN string to validate (optional)
+        normalized: True if gstin is already stripped and upper-cased
         
     Returns:
         True if valid or None
@@ -75,27 +115,18 @@ def validate_gstin(gstin: Optional[str]) -> bool:
     if not gstin:
         return True  # GSTIN is optional
     
-    gstin = gstin.strip().upper()
+    if not normalized:
+        gstin = _norm(gstin)
     
     # GSTIN format: 99AAAAA9999A9Z9
-    pattern = r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$'
-    
-    if not re.match(pattern, gstin):
+    if not _GSTIN_RE.fullmatch(gstin):
         raise ValidationError(
             f"Invalid GSTIN format: {gstin}. "
             "Expected format: 99AAAAA9999A9Z9 (e.g., 27ABCDE1234F1Z5)"
         )
     
-    # Extract PAN from GSTIN (characters 3-12) and validate it
-    pan_from_gstin = gstin[2:12]
-    try:
-        validate_pan(pan_from_gstin)
-    except ValidationError:
-        raise ValidationError(
-            f"Invalid PAN in GSTIN: {pan_from_gstin}. "
-            f"GSTIN {gstin} contains an invalid PAN number."
-        )
-    
+    # Characters 3-12 match the PAN pattern exactly, so a GSTIN that passes
+    # the check above already carries a well-formed PAN
     return True
 
 
@@ -122,7 +153,7 @@ def validate_mobile(mobile: str) -> bool:
         raise ValidationError("Mobile number cannot be empty")
     
     # Remove spaces, hyphens, and parentheses
-    cleaned = re.sub(r'[\s\-\(\)]', '', mobile)
+    cleaned = _MOBILE_CLEAN_RE.sub('', mobile)
     
     # Remove +91 or 91 prefix if present
     if cleaned.startswith('+91'):
@@ -131,9 +162,7 @@ def validate_mobile(mobile: str) -> bool:
         cleaned = cleaned[2:]
     
     # Must be exactly 10 digits and start with 6-9
-    pattern = r'^[6-9][0-9]{9}$'
-    
-    if not re.match(pattern, cleaned):
+    if not _MOBILE_RE.fullmatch(cleaned):
         raise ValidationError(
             f"Invalid mobile number: {mobile}. "
             "Expected 10 digits starting with 6-9 (e.g., 9876543210 or +91 9876543210)"
@@ -159,9 +188,7 @@ def validate_email(email: str) -> bool:
         raise ValidationError("Email cannot be empty")
     
     # Basic email pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(pattern, email.strip()):
+    if not _EMAIL_RE.fullmatch(email.strip()):
         raise ValidationError(
             f"Invalid email format: {email}"
         )
@@ -190,9 +217,7 @@ def validate_pincode(pincode: str) -> bool:
     cleaned = pincode.strip()
     
     # Must be exactly 6 digits
-    pattern = r'^[1-9][0-9]{5}$'
-    
-    if not re.match(pattern, cleaned):
+    if not _PINCODE_RE.fullmatch(cleaned):
         raise ValidationError(
             f"Invalid pincode: {pincode}. "
             "Expected 6 digits (e.g., 110001, 400001)"
@@ -201,7 +226,7 @@ def validate_pincode(pincode: str) -> bool:
     return True
 
 
-def validate_ifsc(ifsc: Optional[str]) -> bool:
+def validate_ifsc(ifsc: Optional[str], *, normalized: bool = False) -> bool:
     """
     Validate IFSC (Indian Financial System Code) format.
     
@@ -212,6 +237,7 @@ def validate_ifsc(ifsc: Optional[str]) -> bool:
     
     Args:
         ifsc: IFSC code string to validate (optional)
+        normalized: True if ifsc is already stripped and upper-cased
         
     Returns:
         True if valid or None
@@ -222,12 +248,11 @@ def validate_ifsc(ifsc: Optional[str]) -> bool:
     if not ifsc:
         return True  # IFSC is optional
     
-    ifsc = ifsc.strip().upper()
+    if not normalized:
+        ifsc = _norm(ifsc)
     
     # IFSC format: AAAA0999999
-    pattern = r'^[A-Z]{4}0[A-Z0-9]{6}$'
-    
-    if not re.match(pattern, ifsc):
+    if not _IFSC_RE.fullmatch(ifsc):
         raise ValidationError(
             f"Invalid IFSC code: {ifsc}. "
             "Expected format: AAAA0999999 (e.g., SBIN0001234)"
@@ -236,14 +261,16 @@ def validate_ifsc(ifsc: Optional[str]) -> bool:
     return True
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_pan(pan: str) -> str:
     """Sanitize and normalize PAN."""
-    return pan.strip().upper() if pan else ""
+    return _norm(pan) if pan else ""
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_gstin(gstin: Optional[str]) -> Optional[str]:
     """Sanitize and normalize GSTIN."""
-    return gstin.strip().upper() if gstin else None
+    return _norm(gstin) if gstin else None
 
 
 def sanitize_mobile(mobile: str) -> str:
@@ -251,8 +278,11 @@ def sanitize_mobile(mobile: str) -> str:
     if not mobile:
         return ""
     
-    # Remove all non-digits
-    cleaned = re.sub(r'\D', '', mobile)
+    # Remove all non-digits; the regex is only needed for non-ASCII input
+    if mobile.isascii():
+        cleaned = mobile.translate(_ASCII_NONDIGITS)
+    else:
+        cleaned = _NONDIGIT_RE.sub('', mobile)
     
     # Remove +91 or 91 prefix if present
     if cleaned.startswith('91') and len(cleaned) > 10:
@@ -266,6 +296,7 @@ def sanitize_pincode(pincode: str) -> str:
     return pincode.strip() if pincode else ""
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_ifsc(ifsc: Optional[str]) -> Optional[str]:
     """Sanitize and normalize IFSC."""
-    return ifsc.strip().upper() if ifsc else None
+    return _norm(ifsc) if ifsc else None
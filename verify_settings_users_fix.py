@@ -14,6 +14,12 @@ Example:
 import sys
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+
+# One session for the whole run so every check reuses the same TLS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 
 def verify_endpoint(base_url):
@@ -35,7 +41,7 @@ def verify_endpoint(base_url):
     print("\nSending GET request...")
     
     try:
-        response = requests.get(endpoint, timeout=30)
+        response = _SESSION.get(endpoint, timeout=30)
         
         print(f"\nStatus Code: {response.status_code}")
         print(f"Response Headers:")
@@ -6,61 +6,247 @@ This script verifies that the FastAPI application can be imported and configured
 Use this to debug deployment issues.
 
 Usage:
-    python verify_startup.py
+    python verify_startup.py [--deep] [--fast] [--use-cache | --refresh] [--profile-imports]
+
+Options:
+    --deep             Import every required package instead of only locating it
+    --fast             Only syntax-check main.py instead of importing the app
+    --use-cache        Reuse a recent passing result and cache this run's outcome
+    --refresh          Ignore the cached result, run every check and cache the outcome
+    --profile-imports  Log the slowest modules imported by `from main import app`
+
+Every check runs by default. With --use-cache a passing run is cached in
+.verify_startup.cache.json, and later --use-cache runs within
+CACHE_TTL_SECONDS exit early while no Python source file, requirements.txt
+or startup environment variable has changed. Deploy gates should not pass
+--use-cache.
 """
+import argparse
+import concurrent.futures
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import subprocess
 import sys
+import tempfile
+import time
 import logging
+import logging.handlers
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+# Log records are buffered and written to stderr in one go when main()
+# finishes, or straight away once an error is logged
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_buffer = logging.handlers.MemoryHandler(
+    capacity=1000,
+    flushLevel=logging.ERROR,
+    target=_stream_handler
 )
+logging.getLogger().addHandler(log_buffer)
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Packages the application cannot start without
+REQUIRED_PACKAGES = ("fastapi", "uvicorn", "sqlalchemy", "psycopg2", "bcrypt", "pydantic")
 
-def verify_imports():
-    """Verify all required modules can be imported."""
-    logger.info("Verifying imports...")
-    try:
-        import fastapi
-        import uvicorn
-        import sqlalchemy
-        import psycopg2
-        import passlib
-        import pydantic
-        logger.info("✓ All required packages are installed")
-        return True
-    except ImportError as e:
-        logger.error("✗ Import error: %s", e)
-        return False
+# Result cache: a passing run is reused while these files are unchanged
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(BASE_DIR, ".verify_startup.cache.json")
+CACHE_TTL_SECONDS = 300
+# Besides every *.py file under BASE_DIR; directories that hold no app code are skipped
+WATCHED_FILES = ("requirements.txt",)
+_UNWATCHED_DIRS = frozenset({"__pycache__", "venv", "env", "node_modules"})
+# Environment variables read while the app starts
+STARTUP_ENV_VARS = (
+    "DATABASE_URL", "DB_HOST", "DB_NAME", "DB_USER", "DB_PASSWORD", "DB_PORT",
+    "PORT", "SECRET_KEY", "ALGORITHM", "ACCESS_TOKEN_EXPIRE_MINUTES",
+    "BCRYPT_ROUNDS", "YEAR_END_DB_FUNCTION",
+)
+
+# Run in a child interpreter by verify_app; the last stdout line is the JSON
+# report. Included routers may not expose a path, hence getattr.
+_APP_PROBE = """
+import json
+from main import app
+print(json.dumps({
+    "title": app.title,
+    "routes": [getattr(route, "path", None) for route in app.routes],
+}))
+"""
+APP_PROBE_TIMEOUT_SECONDS = 30
+
+# Import profiling (--profile-imports): how many modules to list, and the
+# cumulative import time above which a module is flagged
+IMPORT_PROFILE_TOP_N = 15
+SLOW_IMPORT_THRESHOLD_US = 100_000
+
+# Display names for database URL dialects (the part before any +driver)
+_SCHEME_LABELS = {
+    "postgresql": "PostgreSQL",
+    "postgres": "PostgreSQL",
+    "sqlite": "SQLite",
+    "mysql": "MySQL",
+}
+
+
+def verify_imports(deep=False):
+    """
+    Verify all required packages are installed.
+    
+    By default each package is only located with importlib.util.find_spec,
+    which does not execute it. With deep=True every package is imported so
+    that broken installs are caught as well.
+    """
+    logger.info("Verifying imports%s...", " (deep)" if deep else "")
+    if deep:
+        try:
+            for name in REQUIRED_PACKAGES:
+                importlib.import_module(name)
+        except ImportError as e:
+            logger.error("✗ Import error: %s", e)
+            return False
+    else:
+        missing = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+        if missing:
+            logger.error("✗ Missing packages: %s", ", ".join(missing))
+            return False
+    logger.info("✓ All required packages are installed")
+    return True
 
 
 def verify_app():
-    """Verify the FastAPI app can be imported and is configured correctly."""
+    """
+    Verify the FastAPI app can be imported and is configured correctly.
+    
+    The app is imported in a child interpreter so its import cost and side
+    effects stay out of this process; the child reports back as JSON.
+    """
     logger.info("Verifying FastAPI application...")
     try:
-        from main import app
-        logger.info("✓ App imported successfully")
-        logger.info("  - App title: %s", app.title)
-        logger.info("  - Framework: FastAPI")
-        logger.info("  - Total routes: %d", len(app.routes))
-        
-        # Check for critical endpoints
-        routes = [route.path for route in app.routes]
-        critical_endpoints = ['/health', '/', '/docs']
-        
-        for endpoint in critical_endpoints:
-            if endpoint in routes:
-                logger.info("  ✓ %s endpoint found", endpoint)
-            else:
-                logger.warning("  ✗ %s endpoint not found", endpoint)
-                
-        return True
-    except Exception as e:
-        logger.error("✗ Failed to import app: %s", e)
-        import traceback
-        traceback.print_exc()
+        proc = subprocess.run(
+            [sys.executable, "-c", _APP_PROBE],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=APP_PROBE_TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        logger.error("✗ Importing the app took longer than %ds", APP_PROBE_TIMEOUT_SECONDS)
+        return False
+    
+    if proc.returncode != 0:
+        logger.error("✗ Failed to import app (exit code %d):\n%s", proc.returncode, proc.stderr.strip())
+        return False
+    
+    try:
+        info = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        logger.error("✗ Could not read the app probe output: %r", proc.stdout[-500:])
+        return False
+    
+    logger.info("✓ App imported successfully")
+    logger.info("  - App title: %s", info["title"])
+    logger.info("  - Framework: FastAPI")
+    logger.info("  - Total routes: %d", len(info["routes"]))
+    
+    # Check for critical endpoints, stopping as soon as all are found
+    critical_endpoints = ['/health', '/', '/docs']
+    remaining = set(critical_endpoints)
+    for path in info["routes"]:
+        remaining.discard(path)
+        if not remaining:
+            break
+    
+    for endpoint in critical_endpoints:
+        if endpoint not in remaining:
+            logger.info("  ✓ %s endpoint found", endpoint)
+        else:
+            logger.warning("  ✗ %s endpoint not found", endpoint)
+            
+    return True
+
+
+def verify_app_syntax():
+    """
+    Verify main.py exists and compiles, without importing the app.
+    
+    Used by --fast for repeated probes: the source is only compiled in
+    memory, so nothing in main.py runs, no database engine or routers are
+    set up, routes are not checked and no .pyc file is written (the probe
+    may run on a read-only filesystem).
+    """
+    logger.info("Verifying FastAPI application (syntax only)...")
+    main_path = os.path.join(BASE_DIR, "main.py")
+    try:
+        with open(main_path, "rb") as f:
+            source = f.read()
+    except OSError as e:
+        logger.error("✗ Cannot read main.py: %s", e)
+        return False
+    
+    if not source:
+        logger.error("✗ main.py is empty")
         return False
+    
+    try:
+        compile(source, main_path, "exec")
+    except (SyntaxError, ValueError) as e:
+        logger.error("✗ main.py does not compile: %s", e)
+        return False
+    logger.info("✓ main.py compiles")
+    return True
+
+
+def profile_imports():
+    """
+    Log the modules that make `from main import app` slow.
+    
+    The import runs in a child interpreter under -X importtime; its
+    per-module self/cumulative times (in microseconds) are read from stderr
+    and the slowest modules by cumulative time are logged. This is a
+    diagnostic only and never fails the verification.
+    """
+    logger.info("Profiling app imports...")
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "from main import app"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=APP_PROBE_TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("✗ Import profiling took longer than %ds", APP_PROBE_TIMEOUT_SECONDS)
+        return
+    
+    # Lines look like "import time:       123 |       4567 |   package.module"
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+            timings.append((int(cumulative_us), int(self_us), module.strip()))
+        except ValueError:
+            continue  # the "self [us] | cumulative | imported package" header
+    
+    if not timings:
+        logger.warning("✗ No import timings captured (exit code %d)", proc.returncode)
+        return
+    
+    timings.sort(reverse=True)
+    logger.info("  Top %d imports by cumulative time:", IMPORT_PROFILE_TOP_N)
+    for cumulative_us, self_us, module in timings[:IMPORT_PROFILE_TOP_N]:
+        logger.info("  %9.1f ms  (self %7.1f ms)  %s", cumulative_us / 1000, self_us / 1000, module)
+    
+    slow = [module for cumulative_us, _, module in timings if cumulative_us > SLOW_IMPORT_THRESHOLD_US]
+    if slow:
+        logger.warning(
+            "  ✗ %d module(s) take over %d ms to import: %s",
+            len(slow), SLOW_IMPORT_THRESHOLD_US // 1000, ", ".join(slow)
+        )
 
 
 def verify_database_config():
@@ -69,13 +255,11 @@ def verify_database_config():
     try:
         from database import DATABASE_URL
         logger.info("✓ Database URL configured")
-        # Don't log the actual URL as it may contain credentials
-        if "postgresql" in DATABASE_URL:
-            logger.info("  - Database type: PostgreSQL")
-        elif "sqlite" in DATABASE_URL:
-            logger.info("  - Database type: SQLite")
-        else:
-            logger.info("  - Database type: %s", DATABASE_URL.split(":")[0])
+        # Don't log the actual URL as it may contain credentials; only the
+        # scheme is inspected so a password can't affect the reported type
+        scheme = DATABASE_URL.partition(":")[0].lower()
+        dialect = scheme.partition("+")[0]
+        logger.info("  - Database type: %s", _SCHEME_LABELS.get(dialect, scheme))
         return True
     except Exception as e:
         logger.error("✗ Database configuration error: %s", e)
@@ -99,36 +283,166 @@ def verify_environment():
     return True
 
 
-def main():
-    """Run all verification checks."""
+def watched_files():
+    """Return the relative paths of WATCHED_FILES and every *.py file under BASE_DIR, sorted."""
+    paths = list(WATCHED_FILES)
+    for root, dirs, files in os.walk(BASE_DIR):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in _UNWATCHED_DIRS]
+        rel_root = os.path.relpath(root, BASE_DIR)
+        paths.extend(
+            os.path.normpath(os.path.join(rel_root, name))
+            for name in files
+            if name.endswith(".py")
+        )
+    return sorted(paths)
+
+
+def source_fingerprint(deep=False, fast=False):
+    """
+    Hash everything a cached result depends on.
+    
+    That is the check mode, the path, mtime and size of every watched file,
+    and the values of STARTUP_ENV_VARS. Only the digest is stored, so
+    secrets in the environment never reach the cache file.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(b"deep" if deep else b"shallow")
+    digest.update(b"fast" if fast else b"full")
+    for name in watched_files():
+        try:
+            st = os.stat(os.path.join(BASE_DIR, name))
+            entry = f"{name}:{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            entry = f"{name}:missing"
+        digest.update(entry.encode() + b"\0")
+    for name in STARTUP_ENV_VARS:
+        value = os.environ.get(name)
+        entry = f"{name}:unset" if value is None else f"{name}={value}"
+        digest.update(entry.encode() + b"\0")
+    return digest.hexdigest()
+
+
+def load_cached_pass(fingerprint):
+    """
+    Return the cached results if a fresh passing run matches fingerprint.
+    
+    Any problem reading the cache is treated as a miss, so a corrupt or
+    unreadable cache file only means the checks run again.
+    """
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["fingerprint"] != fingerprint:
+            return None
+        if time.time() - cached["checked_at"] > CACHE_TTL_SECONDS:
+            return None
+        results = cached["results"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return results if results and all(result for _, result in results) else None
+
+
+def save_results(fingerprint, results):
+    """Atomically write the results of this run to the cache file."""
+    payload = {"fingerprint": fingerprint, "checked_at": time.time(), "results": results}
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=BASE_DIR, prefix=".verify_startup.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except OSError as e:
+        logger.warning("Could not write verification cache: %s", e)
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Verify the backend can start.")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="import every required package instead of only locating it"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="only syntax-check main.py instead of importing the app"
+    )
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="reuse a recent passing result and cache this run's outcome"
+    )
+    cache_mode.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore the cached result, run every check and cache the outcome"
+    )
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="log the slowest modules imported by `from main import app`"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run all verification checks, writing the buffered log output at the end."""
+    try:
+        return _run_checks(parse_args(argv))
+    finally:
+        log_buffer.flush()
+
+
+def _run_checks(args):
+    """Run the checks selected by args and log a summary; return the exit code."""
     logger.info("="*60)
     logger.info("RNRL TradeHub Backend - Startup Verification")
     logger.info("="*60)
     
+    if args.profile_imports:
+        profile_imports()
+    
+    # The cache is opt-in; without --use-cache or --refresh every check runs
+    # and nothing is written
+    fingerprint = None
+    if args.use_cache or args.refresh:
+        fingerprint = source_fingerprint(deep=args.deep, fast=args.fast)
+    if args.use_cache:
+        cached = load_cached_pass(fingerprint)
+        if cached:
+            logger.info("✓ Cached PASS - sources and environment unchanged since the last successful run")
+            logger.info("  (use --refresh to re-run every check)")
+            return 0
+    
     checks = [
-        ("Imports", verify_imports),
+        ("Imports", lambda: verify_imports(deep=args.deep)),
         ("Environment", verify_environment),
         ("Database Config", verify_database_config),
-        ("FastAPI App", verify_app),
+        ("FastAPI App", verify_app_syntax if args.fast else verify_app),
     ]
     
-    results = []
-    for name, check in checks:
-        logger.info("")
-        result = check()
-        results.append((name, result))
+    # The checks are independent, so run them side by side; results are
+    # collected in declaration order so the summary stays stable
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [(name, executor.submit(check)) for name, check in checks]
+        results = [(name, future.result()) for name, future in futures]
+    
+    if fingerprint is not None:
+        save_results(fingerprint, results)
+    
+    all_passed = all(result for _, result in results)
     
     logger.info("")
     logger.info("="*60)
     logger.info("Verification Summary")
     logger.info("="*60)
     
-    all_passed = True
     for name, result in results:
         status = "✓ PASS" if result else "✗ FAIL"
+        if result and args.fast and name == "FastAPI App":
+            status = "✓ syntax-only pass (routes not checked)"
         logger.info("%s: %s", name, status)
-        if not result:
-            all_passed = False
     
     logger.info("="*60)
     